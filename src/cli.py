@@ -0,0 +1,218 @@
+"""
+Unified command line for the district evolution pipeline.
+
+    python src/cli.py render --state "Bihar" --renderer timeline
+    python src/cli.py query --state "Bihar" --district "Patna"
+    python src/cli.py serve --port 8000
+    python src/cli.py all
+
+Heavy libraries (pandas, networkx and the plotting backends) are imported
+inside the subcommands that need them, and single-state commands read only
+that state's rows from the processed CSV.
+"""
+import argparse
+import csv
+import difflib
+import json
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRANSFORM_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'district_changes.csv')
+
+YEAR_COLUMNS = ['source_year', 'dest_year']
+
+def read_state_rows(state=None, transform_file=TRANSFORM_FILE):
+    """
+    Streams the processed CSV and returns (header, rows) for one state, or
+    for every state when state is None. Uses the csv module so that queries
+    never need pandas.
+    """
+    with open(transform_file, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = [h.strip() for h in next(reader)]
+        if 'filter_state' not in header and 'state' in header:
+            header[header.index('state')] = 'filter_state'
+        state_idx = header.index('filter_state')
+        if state is None:
+            rows = list(reader)
+        else:
+            rows = [row for row in reader if row[state_idx] == state]
+    return header, rows
+
+def list_states(transform_file=TRANSFORM_FILE):
+    header, rows = read_state_rows(None, transform_file)
+    state_idx = header.index('filter_state')
+    return sorted({row[state_idx] for row in rows if row[state_idx]})
+
+def rows_to_frame(header, rows):
+    import pandas as pd
+    df = pd.DataFrame(rows, columns=header)
+    for col in YEAR_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    return df
+
+def parse_year(val):
+    try:
+        return int(float(val))
+    except (TypeError, ValueError):
+        return None
+
+def resolve_state(state):
+    header, rows = read_state_rows(state)
+    if rows:
+        return header, rows
+    states = list_states()
+    matches = [s for s in states if s.lower() == state.lower()]
+    if matches:
+        return read_state_rows(matches[0])
+    suggestions = difflib.get_close_matches(state, states, n=3)
+    hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+    print(f"No data found for state: {state}.{hint}")
+    return header, []
+
+def cmd_etl(args):
+    from etl import process_district_data
+    return 0 if process_district_data() else 1
+
+def cmd_render(args):
+    from renderers import render_timeline, render_state
+
+    header, rows = resolve_state(args.state)
+    if not rows:
+        return 1
+    state = rows[0][header.index('filter_state')]
+    state_df = rows_to_frame(header, rows)
+
+    renderers = args.renderer or ['timeline']
+    if args.show and renderers == ['timeline']:
+        render_timeline(state, state_df, show=True)
+        return 0
+
+    from output_writer import OutputWriter
+    with OutputWriter() as writer:
+        paths = render_state(state, state_df, renderers, writer)
+    failed_paths = {path for path, _ in writer.close()}
+    paths = [path for path in paths if path not in failed_paths]
+
+    if args.show:
+        import webbrowser
+        for path in paths:
+            webbrowser.open(f"file://{path}")
+    return 1 if failed_paths or len(paths) < len(renderers) else 0
+
+def cmd_query(args):
+    if not args.state:
+        for state in list_states():
+            print(state)
+        return 0
+
+    header, rows = resolve_state(args.state)
+    if not rows:
+        return 1
+    col = {name: i for i, name in enumerate(header)}
+    state = rows[0][col['filter_state']]
+
+    parents = {}
+    children = {}
+    formed = {}
+    for row in rows:
+        src = row[col['source_district']]
+        dst = row[col['dest_district']]
+        year = parse_year(row[col['dest_year']])
+        children.setdefault(src, []).append(dst)
+        parents.setdefault(dst, []).append(src)
+        children.setdefault(dst, [])
+        parents.setdefault(src, [])
+        if year is not None and (dst not in formed or year < formed[dst]):
+            formed[dst] = year
+
+    if args.district is None:
+        payload = {
+            'state': state,
+            'districts': sorted(children),
+            'edges': [{'source': row[col['source_district']], 'dest': row[col['dest_district']],
+                       'year': parse_year(row[col['dest_year']])} for row in rows],
+        }
+    else:
+        district = args.district
+        if district not in children:
+            print(f"No district named {district} in {state}.")
+            return 1
+        descendants = set()
+        stack = [district]
+        while stack:
+            for child in children[stack.pop()]:
+                if child not in descendants and child != district:
+                    descendants.add(child)
+                    stack.append(child)
+        payload = {
+            'state': state,
+            'district': district,
+            'formed': formed.get(district),
+            'parents': sorted(set(parents[district])),
+            'children': sorted(set(children[district])),
+            'descendants': sorted(descendants),
+        }
+
+    print(json.dumps(payload, indent=2))
+    return 0
+
+def cmd_serve(args):
+    import serve
+    argv = ['--host', args.host, '--port', str(args.port), '--interval', str(args.interval)]
+    if args.renderer:
+        argv += ['--renderers', ','.join(args.renderer)]
+    if args.write:
+        argv.append('--write')
+    serve.main(argv)
+    return 0
+
+def cmd_all(args):
+    import main
+    return main.main()
+
+def build_parser():
+    from renderers import RENDERERS
+
+    parser = argparse.ArgumentParser(prog='cli.py', description="District evolution pipeline.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('etl', help="Transform the raw workbook into the processed CSV")
+    p.set_defaults(func=cmd_etl)
+
+    p = sub.add_parser('render', help="Render a single state")
+    p.add_argument('--state', required=True)
+    p.add_argument('--renderer', action='append', choices=RENDERERS,
+                   help="Renderer to run; repeat for several (default: timeline)")
+    p.add_argument('--show', action='store_true', help="Open the result after rendering")
+    p.set_defaults(func=cmd_render)
+
+    p = sub.add_parser('query', help="Print lineage data as JSON")
+    p.add_argument('--state', help="State to query; lists all states when omitted")
+    p.add_argument('--district', help="District to describe within the state")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser('serve', help="Serve pages from memory and rebuild on workbook changes")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8000)
+    p.add_argument('--renderer', action='append', choices=RENDERERS)
+    p.add_argument('--write', action='store_true')
+    p.add_argument('--interval', type=float, default=0.25)
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('all', help="Run the full batch pipeline")
+    p.set_defaults(func=cmd_all)
+
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command in ('render', 'query') and not os.path.exists(TRANSFORM_FILE):
+        print(f"Error: {TRANSFORM_FILE} not found. Please run etl.py first.")
+        return 1
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,17 @@
 import pandas as pd
 import os
+import sys
+from output_writer import write_atomic
+
+def transform_district_data(df):
+    df.columns = df.columns.str.strip()
+    
+    str_cols = ['source_district', 'dest_district', 'filter_state']
+    for col in str_cols:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+            
+    return df[df['source_district'] != df['dest_district']].copy()
 
 def process_district_data():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -13,19 +25,12 @@ def process_district_data():
         print(f"Error: {input_file} not found.")
         return
 
-    df.columns = df.columns.str.strip()
-    
     print("Filtering data...")
-    str_cols = ['source_district', 'dest_district', 'filter_state']
-    for col in str_cols:
-        if col in df.columns:
-            df[col] = df[col].astype(str).str.strip()
-            
-    filtered_df = df[df['source_district'] != df['dest_district']].copy()
+    filtered_df = transform_district_data(df)
     
     print(f"Saving transformed data to {transform_output}...")
-    filtered_df.to_csv(transform_output, index=False)
+    write_atomic(transform_output, filtered_df.to_csv(index=False))
     return True
 
 if __name__ == "__main__":
-    process_district_data()
+    sys.exit(0 if process_district_data() else 1)
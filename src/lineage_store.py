@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+
+UNKNOWN_YEAR = -1
+
+def _expand(offsets, nodes):
+    """
+    Returns the CSR positions of every edge leaving the given nodes, in node
+    order, without a Python loop over the nodes.
+    """
+    starts = offsets[nodes]
+    counts = offsets[nodes + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    shifts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return shifts + np.arange(total)
+
+class LineageStore:
+    """
+    Compact district lineage graph.
+
+    District names are interned to integer ids (in order of first appearance,
+    the same order networkx would add them). Edges are kept as CSR arrays:
+    the children of node i are targets[offsets[i]:offsets[i + 1]] with the
+    matching census years in years. A second CSR over in-edges gives parents.
+    Rows are stored as given, so duplicate rows are kept; edge_rows maps each
+    CSR edge back to its row so the original order can be replayed.
+    """
+
+    def __init__(self, names, sources, targets, years):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+
+        sources = np.asarray(sources, dtype=np.int32)
+        targets = np.asarray(targets, dtype=np.int32)
+        years = np.asarray(years, dtype=np.int16)
+
+        order = np.argsort(sources, kind='stable')
+        self.offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(sources, minlength=n), out=self.offsets[1:])
+        self.targets = targets[order]
+        self.years = years[order]
+        self.edge_rows = order.astype(np.int32)
+
+        # Position of each row inside the CSR arrays, used to link in-edges
+        # back to their year without storing the years twice.
+        csr_pos = np.empty(len(order), dtype=np.int32)
+        csr_pos[order] = np.arange(len(order), dtype=np.int32)
+
+        in_order = np.argsort(targets, kind='stable')
+        self.in_offsets = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(np.bincount(targets, minlength=n), out=self.in_offsets[1:])
+        self.in_sources = sources[in_order]
+        self.in_edges = csr_pos[in_order]
+
+    @classmethod
+    def from_frame(cls, df):
+        if df.empty:
+            return cls([], [], [], [])
+        pairs = np.column_stack([
+            df['source_district'].astype(str).to_numpy(),
+            df['dest_district'].astype(str).to_numpy(),
+        ]).ravel()
+        codes, names = pd.factorize(pairs)
+        codes = codes.reshape(-1, 2)
+        years = pd.to_numeric(df['dest_year'], errors='coerce').fillna(UNKNOWN_YEAR).astype(np.int16)
+        return cls(names, codes[:, 0], codes[:, 1], years.to_numpy())
+
+    @property
+    def num_nodes(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.targets)
+
+    @property
+    def nbytes(self):
+        arrays = [self.offsets, self.targets, self.years, self.edge_rows,
+                  self.in_offsets, self.in_sources, self.in_edges]
+        return sum(a.nbytes for a in arrays)
+
+    def sources(self):
+        return np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.offsets))
+
+    def _distinct_edges(self):
+        keys = np.unique(self.sources().astype(np.int64) * max(self.num_nodes, 1) + self.targets)
+        return keys // max(self.num_nodes, 1), keys % max(self.num_nodes, 1)
+
+    def out_degree(self):
+        src, _ = self._distinct_edges()
+        return np.bincount(src, minlength=self.num_nodes)
+
+    def in_degree(self):
+        _, dst = self._distinct_edges()
+        return np.bincount(dst, minlength=self.num_nodes)
+
+    def degree(self):
+        return self.out_degree() + self.in_degree()
+
+    def successors(self, name):
+        i = self.ids[name]
+        children = self.targets[self.offsets[i]:self.offsets[i + 1]]
+        return [self.names[j] for j in dict.fromkeys(children.tolist())]
+
+    def predecessors(self, name):
+        i = self.ids[name]
+        parents = self.in_sources[self.in_offsets[i]:self.in_offsets[i + 1]]
+        return [self.names[j] for j in dict.fromkeys(parents.tolist())]
+
+    def descendants(self, name):
+        visited = np.zeros(self.num_nodes, dtype=bool)
+        frontier = np.array([self.ids[name]], dtype=np.int32)
+        while frontier.size:
+            reached = np.unique(self.targets[_expand(self.offsets, frontier)])
+            frontier = reached[~visited[reached]]
+            visited[frontier] = True
+        visited[self.ids[name]] = False
+        return [self.names[j] for j in np.flatnonzero(visited)]
+
+    def earliest_in_years(self):
+        """
+        Earliest known year among each district's in-edges, or UNKNOWN_YEAR
+        for districts with no dated in-edge.
+        """
+        known = self.years != UNKNOWN_YEAR
+        result = np.full(self.num_nodes, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(result, self.targets[known], self.years[known])
+        result[result == np.iinfo(np.int64).max] = UNKNOWN_YEAR
+        return result
+
+    def earliest_in_year(self, name):
+        """
+        Earliest known year among the in-edges of one district, or None.
+        """
+        i = self.ids[name]
+        in_years = self.years[self.in_edges[self.in_offsets[i]:self.in_offsets[i + 1]]]
+        in_years = in_years[in_years != UNKNOWN_YEAR]
+        return int(in_years.min()) if in_years.size else None
+
+    def first_seen_years(self):
+        """
+        Year each district first exists in the data: its earliest dated
+        in-edge, or its earliest dated split if that comes first. Districts
+        with no dated in-edge are originals and get UNKNOWN_YEAR. Unlike
+        formation_years() this never holds a district back to a later
+        re-link, so it suits views that replay history in order.
+        """
+        first = self.earliest_in_years()
+        known = self.years != UNKNOWN_YEAR
+        first_split = np.full(self.num_nodes, np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(first_split, self.sources()[known], self.years[known])
+        return np.where(first != UNKNOWN_YEAR, np.minimum(first, first_split), UNKNOWN_YEAR)
+
+    def formation_years(self):
+        """
+        Year each district was formed: the year of its last in-edge (in row
+        order) with a known year, or UNKNOWN_YEAR for districts that only
+        appear as sources.
+        """
+        known = self.years != UNKNOWN_YEAR
+        last_row = np.full(self.num_nodes, -1, dtype=np.int64)
+        np.maximum.at(last_row, self.targets[known], self.edge_rows[known])
+
+        years_by_row = np.empty(self.num_edges, dtype=np.int16)
+        years_by_row[self.edge_rows] = self.years
+        result = np.full(self.num_nodes, UNKNOWN_YEAR, dtype=np.int64)
+        has_year = last_row >= 0
+        result[has_year] = years_by_row[last_row[has_year]]
+        return result
+
+    def fill_unknown_years(self, years):
+        """
+        Places districts without a known year just before the earliest known
+        one (five years earlier, or 1950 when no year is known), as the
+        timeline and the animation draw them. Returns (years, known) where
+        known marks the districts that had a year of their own.
+        """
+        years = np.asarray(years)
+        known = years != UNKNOWN_YEAR
+        base_year = int(years[known].min()) - 5 if known.any() else 1950
+        return np.where(known, years, base_year), known
+
+    def _year_order(self, years):
+        names = np.array(self.names, dtype=object)
+        name_rank = np.empty(self.num_nodes, dtype=np.int64)
+        name_rank[np.argsort(names, kind='stable')] = np.arange(self.num_nodes)
+        order = np.lexsort((name_rank, years))
+        bucket_years, starts, counts = np.unique(years[order], return_index=True, return_counts=True)
+        return order, bucket_years, starts, counts
+
+    def nodes_by_year(self, years):
+        """
+        Groups districts by the given per-node years. Returns {year: [names]}
+        with years ascending and names sorted within each year.
+        """
+        order, bucket_years, starts, counts = self._year_order(np.asarray(years))
+        return {
+            int(year): [self.names[j] for j in order[start:start + count]]
+            for year, start, count in zip(bucket_years, starts, counts)
+        }
+
+    def layered_positions(self, years):
+        """
+        Timeline layout: x is the node's year, y spreads the nodes of each
+        year evenly around zero in name order. Returns (xs, ys) indexed by id.
+        """
+        years = np.asarray(years)
+        order, _, starts, counts = self._year_order(years)
+        rank_in_year = np.arange(self.num_nodes) - np.repeat(starts, counts)
+        ys = np.empty(self.num_nodes, dtype=float)
+        ys[order] = rank_in_year - (np.repeat(counts, counts) - 1) / 2
+        return years.copy(), ys
+
+    def edges(self):
+        """
+        Yields (source, dest, year) in the original row order, with year None
+        when unknown.
+        """
+        row_order = np.argsort(self.edge_rows, kind='stable')
+        sources = self.sources()[row_order]
+        for s, t, y in zip(sources.tolist(), self.targets[row_order].tolist(), self.years[row_order].tolist()):
+            yield self.names[s], self.names[t], (None if y == UNKNOWN_YEAR else y)
+
+    def children_by_parent(self):
+        """
+        Returns {parent: [(child, year), ...]} with each list in row order,
+        the shape the tree renderer builds its adjacency list from.
+        """
+        adj = {}
+        for src, dst, year in self.edges():
+            adj.setdefault(src, []).append((dst, year))
+        return adj
+
+    def to_networkx(self):
+        import networkx as nx
+        G = nx.DiGraph()
+        G.add_nodes_from(self.names)
+        G.add_edges_from((src, dst, {'year': year}) for src, dst, year in self.edges())
+        return G
+
+    def to_frame(self, state=None):
+        records = [
+            {'source_district': src, 'dest_district': dst, 'dest_year': (np.nan if year is None else year)}
+            for src, dst, year in self.edges()
+        ]
+        df = pd.DataFrame(records, columns=['source_district', 'dest_district', 'dest_year'])
+        if state is not None:
+            df['filter_state'] = state
+        return df
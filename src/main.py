@@ -1,28 +1,36 @@
 import os
 import sys
 
+def run_step(script):
+    return os.system(f"{sys.executable} src/{script}") == 0
+
 def main():
     print("Starting District Evolution Pipeline...")
-    
-    print("\n[1/5] Running ETL...")
-    exit_code = os.system(f"{sys.executable} src/etl.py")
-    if exit_code != 0:
+
+    print("\n[1/6] Running ETL...")
+    if not run_step("etl.py"):
         print("ETL failed. Exiting.")
-        return
+        return 1
+
+    steps = [
+        ("[2/6] Generating Static Visuals...", "visualize_static.py"),
+        ("[3/6] Generating Interactive Network Graphs...", "visualize_interactive_network.py"),
+        ("[4/6] Generating Interactive Timelines...", "visualize_interactive_timeline.py"),
+        ("[5/6] Generating Professional Trees...", "visualize_professional_tree.py"),
+        ("[6/6] Generating Evolution Animations...", "visualize_animation.py"),
+    ]
+    failed = []
+    for label, script in steps:
+        print(f"\n{label}")
+        if not run_step(script):
+            failed.append(script)
 
-    print("\n[2/5] Generating Static Visuals...")
-    os.system(f"{sys.executable} src/visualize_static.py")
+    if failed:
+        print(f"\nPipeline finished with errors in: {', '.join(failed)}")
+        return 1
 
-    print("\n[3/5] Generating Interactive Network Graphs...")
-    os.system(f"{sys.executable} src/visualize_interactive_network.py")
-    
-    print("\n[4/5] Generating Interactive Timelines...")
-    os.system(f"{sys.executable} src/visualize_interactive_timeline.py")
-    
-    print("\n[5/5] Generating Professional Trees...")
-    os.system(f"{sys.executable} src/visualize_professional_tree.py")
-    
     print("\nPipeline Complete!")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
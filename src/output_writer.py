@@ -0,0 +1,169 @@
+import os
+import queue
+import stat
+import tempfile
+import threading
+import time
+
+DEFAULT_MAX_PENDING = 8
+DEFAULT_WORKERS = 2
+
+TEMP_PREFIX = "."
+TEMP_SUFFIX = ".tmp"
+# Temp files older than this are left over from a killed run, not a live writer.
+STALE_TEMP_SECONDS = 600
+
+# os.umask() can only be read by setting it, so do that once at import time
+# rather than from the worker threads.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_swept_dirs = set()
+_swept_lock = threading.Lock()
+
+def sweep_stale_temp_files(directory, max_age=STALE_TEMP_SECONDS):
+    """
+    Removes temp files that an interrupted write_atomic() left in directory.
+    Returns the number of files removed.
+    """
+    removed = 0
+    now = time.time()
+    for name in os.listdir(directory):
+        if not (name.startswith(TEMP_PREFIX) and name.endswith(TEMP_SUFFIX)):
+            continue
+        tmp_path = os.path.join(directory, name)
+        try:
+            if now - os.path.getmtime(tmp_path) >= max_age:
+                os.remove(tmp_path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+def _sweep_once(directory):
+    with _swept_lock:
+        if directory in _swept_dirs:
+            return
+        _swept_dirs.add(directory)
+    sweep_stale_temp_files(directory)
+
+def write_atomic(path, data):
+    """
+    Writes data to a temporary file next to path and renames it into place,
+    so readers only ever see the old file or the complete new one. The file
+    keeps the mode of the file it replaces, or gets the usual umask-based
+    mode when it is new.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    if not os.path.exists(directory):
+        os.makedirs(directory, exist_ok=True)
+    _sweep_once(directory)
+
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{TEMP_PREFIX}{os.path.basename(path)}.", suffix=TEMP_SUFFIX)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+class OutputWriter:
+    """
+    Background writer for rendered pages and images.
+
+    Renderers call submit() with the finished bytes and carry on with the next
+    state while worker threads write them out with write_atomic(). The queue is
+    bounded by max_pending, so submit() blocks once that many files are waiting.
+    """
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING, workers=DEFAULT_WORKERS):
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._errors = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._threads = []
+        for i in range(workers):
+            t = threading.Thread(target=self._run, name=f"output-writer-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                path, data = item
+                try:
+                    if data is None:
+                        if os.path.exists(path):
+                            os.remove(path)
+                    else:
+                        write_atomic(path, data)
+                except Exception as e:
+                    with self._lock:
+                        self._errors.append((path, e))
+            finally:
+                self._queue.task_done()
+
+    def submit(self, path, data):
+        if self._closed:
+            raise RuntimeError("OutputWriter is closed")
+        self._queue.put((path, data))
+
+    def remove(self, path):
+        """
+        Queues the deletion of path behind any pending writes, so a file that
+        is no longer produced does not linger in the published output.
+        """
+        self.submit(path, None)
+
+    def flush(self):
+        self._queue.join()
+
+    def close(self):
+        """
+        Waits for every pending write and stops the workers. Returns the list of
+        (path, exception) pairs for writes that failed; calling it again after
+        the writer is closed just returns the same list.
+        """
+        if self._closed:
+            with self._lock:
+                return list(self._errors)
+
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for t in self._threads:
+            t.join()
+        with self._lock:
+            errors = list(self._errors)
+        for path, e in errors:
+            print(f"Error writing {path}: {e}")
+        return errors
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+def emit(path, data, writer=None):
+    if writer is not None:
+        writer.submit(path, data)
+    else:
+        write_atomic(path, data)
@@ -0,0 +1,51 @@
+import os
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+RENDERERS = ['interactive', 'timeline', 'professional', 'static', 'animation']
+
+# Each renderer imports its plotting backend only when it is first used, so a
+# single-renderer run does not pay for pyvis, plotly, pyecharts and matplotlib.
+
+def render_interactive(state, state_df, writer=None):
+    from visualize_interactive_network import create_interactive_graph
+    return create_interactive_graph(state, state_df, os.path.join(OUTPUT_DIR, 'interactive'), writer=writer)
+
+def render_timeline(state, state_df, writer=None, show=False):
+    from visualize_interactive_timeline import generate_plotly_graph
+    save_dir = None if show else os.path.join(OUTPUT_DIR, 'interactive')
+    return generate_plotly_graph(state, state_df, save_dir=save_dir, writer=writer)
+
+def render_professional(state, state_df, writer=None):
+    from visualize_professional_tree import generate_professional_chart
+    return generate_professional_chart(state, state_df, os.path.join(OUTPUT_DIR, 'professional'), writer=writer)
+
+def render_static(state, state_df, writer=None):
+    import matplotlib
+    matplotlib.use("Agg")
+    from visualize_static import generate_static_graph
+    output_path = os.path.join(OUTPUT_DIR, 'static', f"{state}_lineage.png".replace(" ", "_"))
+    generate_static_graph(state, state_df, output_path, writer=writer)
+    return output_path
+
+def render_animation(state, state_df, writer=None):
+    from visualize_animation import generate_animation
+    return generate_animation(state, state_df, os.path.join(OUTPUT_DIR, 'animation'), writer=writer)
+
+def render_state(state, state_df, renderers, writer=None):
+    paths = []
+    for name in renderers:
+        if name == 'interactive':
+            paths.append(render_interactive(state, state_df, writer))
+        elif name == 'timeline':
+            paths.append(render_timeline(state, state_df, writer))
+        elif name == 'professional':
+            paths.append(render_professional(state, state_df, writer))
+        elif name == 'static':
+            paths.append(render_static(state, state_df, writer))
+        elif name == 'animation':
+            paths.append(render_animation(state, state_df, writer))
+        else:
+            raise ValueError(f"Unknown renderer: {name}")
+    return [p for p in paths if p]
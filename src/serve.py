@@ -0,0 +1,311 @@
+"""
+Watch/serve mode: loads the district data once, keeps the per-state graphs
+and rendered pages in memory, and re-runs only the affected stages when the
+source workbook in data/raw changes.
+
+    python src/serve.py --port 8000
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+
+import pandas as pd
+
+from etl import transform_district_data
+from lineage_store import LineageStore
+from output_writer import OutputWriter, write_atomic
+from renderers import OUTPUT_DIR, RENDERERS, render_state
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RAW_DIR = os.path.join(BASE_DIR, 'data', 'raw')
+INPUT_FILE = os.path.join(RAW_DIR, 'district_proliferation_1951_2024.xlsx')
+TRANSFORM_FILE = os.path.join(BASE_DIR, 'data', 'processed', 'district_changes.csv')
+REQUIRED_COLUMNS = ['source_district', 'dest_district', 'dest_year', 'filter_state']
+CONTENT_TYPES = {'.html': 'text/html; charset=utf-8', '.png': 'image/png', '.md': 'text/markdown; charset=utf-8'}
+
+class MemoryWriter:
+    """
+    Collects rendered files in a dict keyed by absolute path. Has the same
+    submit() interface as OutputWriter so the renderers can be pointed at it.
+    Nothing reaches disk from here; the store decides what to write once a
+    state has rendered completely.
+    """
+
+    def __init__(self):
+        self.files = {}
+
+    def submit(self, path, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.files[os.path.abspath(path)] = data
+
+class DistrictStore:
+    """
+    In-memory view of the processed data. Each state keeps a fingerprint of
+    its rows, its LineageStore and the files rendered for it, so a rebuild
+    only touches states whose rows actually changed.
+    """
+
+    def __init__(self, renderers, disk_writer=None):
+        self.renderers = renderers
+        self.disk_writer = disk_writer
+        self.states = {}
+        self.status = {}
+        self._lock = threading.Lock()
+
+    def rebuild(self):
+        """
+        Reloads the workbook and re-renders the states whose rows changed.
+        Any failure leaves the last good states in place and is reported
+        through /api/status instead of stopping the server.
+        """
+        start = time.perf_counter()
+        try:
+            df = transform_district_data(pd.read_excel(INPUT_FILE))
+            if 'filter_state' not in df.columns and 'state' in df.columns:
+                df = df.rename(columns={'state': 'filter_state'})
+            missing = [c for c in REQUIRED_COLUMNS if c not in df.columns]
+            if missing:
+                raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+            new_states = {}
+            changed = []
+            state_errors = {}
+            for state, state_df in df.groupby('filter_state', sort=True):
+                fingerprint = state_df.to_csv(index=False)
+                previous = self.states.get(state)
+                if previous is not None and previous['fingerprint'] == fingerprint:
+                    new_states[state] = previous
+                    continue
+
+                try:
+                    entry = self._build_state(state, state_df, fingerprint)
+                except Exception as e:
+                    print(f"Error rendering {state}: {e}")
+                    state_errors[state] = str(e)
+                    if previous is not None:
+                        new_states[state] = previous
+                    continue
+                new_states[state] = entry
+                changed.append(state)
+
+            write_atomic(TRANSFORM_FILE, df.to_csv(index=False))
+        except Exception as e:
+            print(f"Rebuild failed, still serving the last good build: {e}")
+            with self._lock:
+                self.status = dict(self.status, error=str(e), failed_at=time.strftime('%Y-%m-%dT%H:%M:%S'))
+            return None
+
+        removed = sorted(set(self.states) - set(new_states) - set(state_errors))
+        self._write_files(new_states, changed)
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.states = new_states
+            self.status = {
+                'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'rebuild_seconds': round(elapsed, 3),
+                'changed_states': changed,
+                'removed_states': removed,
+                'state_errors': state_errors,
+                'error': None,
+            }
+        print(f"Rebuilt {len(changed)} state(s) in {elapsed:.2f}s" + (f", removed {removed}" if removed else ""))
+        return changed
+
+    def _build_state(self, state, state_df, fingerprint):
+        writer = MemoryWriter()
+        render_state(state, state_df, self.renderers, writer)
+        return {
+            'fingerprint': fingerprint,
+            'lineage': LineageStore.from_frame(state_df),
+            'files': writer.files,
+        }
+
+    def _write_files(self, new_states, changed):
+        """
+        With --write, mirrors the new build to output/: writes the files of
+        states that rendered completely, and deletes files the previous build
+        wrote but the new one no longer produces, e.g. pages of removed
+        states. States that failed to render keep their previous files.
+        """
+        if self.disk_writer is None:
+            return
+        for state in changed:
+            for path, data in new_states[state]['files'].items():
+                self.disk_writer.submit(path, data)
+        current = set()
+        for entry in new_states.values():
+            current.update(entry['files'])
+        for entry in self.states.values():
+            for path in entry['files']:
+                if path not in current:
+                    self.disk_writer.remove(path)
+
+    def get_file(self, path):
+        with self._lock:
+            states = self.states
+        for entry in states.values():
+            data = entry['files'].get(path)
+            if data is not None:
+                return data
+        return None
+
+    def get_state(self, state):
+        with self._lock:
+            return self.states.get(state)
+
+    def list_states(self):
+        with self._lock:
+            states = self.states
+            status = dict(self.status)
+        return states, status
+
+def state_payload(state, entry):
+    store = entry['lineage']
+    return {
+        'state': state,
+        'districts': sorted(store.names),
+        'edges': [{'source': src, 'dest': dst, 'year': year} for src, dst, year in store.edges()],
+        'pages': sorted(os.path.relpath(p, OUTPUT_DIR).replace(os.sep, '/') for p in entry['files']),
+    }
+
+def district_payload(state, entry, district):
+    store = entry['lineage']
+    if district not in store.ids:
+        return None
+    return {
+        'state': state,
+        'district': district,
+        'formed': store.earliest_in_year(district),
+        'parents': sorted(store.predecessors(district)),
+        'children': sorted(store.successors(district)),
+        'descendants': sorted(store.descendants(district)),
+    }
+
+def make_handler(store):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, code, body, content_type):
+            self.send_response(code)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-cache')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_json(self, code, payload):
+            self._send(code, json.dumps(payload).encode('utf-8'), 'application/json')
+
+        def do_GET(self):
+            parts = [unquote(p) for p in urlparse(self.path).path.split('/') if p]
+
+            if not parts:
+                states, status = store.list_states()
+                links = []
+                for state, entry in states.items():
+                    for path in sorted(entry['files']):
+                        rel = os.path.relpath(path, OUTPUT_DIR).replace(os.sep, '/')
+                        links.append(f"<li><a href='/{rel}'>{rel}</a></li>")
+                html = (f"<html><head><meta charset='utf-8'><title>District Evolution</title></head><body>"
+                        f"<h1>District Evolution</h1><p>Last rebuild: {status.get('updated_at', '-')}</p>"
+                        f"<ul>{''.join(links)}</ul></body></html>")
+                return self._send(200, html.encode('utf-8'), CONTENT_TYPES['.html'])
+
+            if parts[0] == 'api':
+                states, status = store.list_states()
+                if parts[1:] == ['status']:
+                    return self._send_json(200, status)
+                if parts[1:] == ['states']:
+                    return self._send_json(200, [
+                        {'state': s, 'districts': e['lineage'].num_nodes, 'changes': e['lineage'].num_edges}
+                        for s, e in states.items()
+                    ])
+                if len(parts) >= 3 and parts[1] == 'states':
+                    entry = store.get_state(parts[2])
+                    if entry is None:
+                        return self._send_json(404, {'error': f"Unknown state: {parts[2]}"})
+                    if len(parts) == 3:
+                        return self._send_json(200, state_payload(parts[2], entry))
+                    if len(parts) == 5 and parts[3] == 'districts':
+                        payload = district_payload(parts[2], entry, parts[4])
+                        if payload is None:
+                            return self._send_json(404, {'error': f"Unknown district: {parts[4]}"})
+                        return self._send_json(200, payload)
+                return self._send_json(404, {'error': 'Not found'})
+
+            path = os.path.abspath(os.path.join(OUTPUT_DIR, *parts))
+            data = store.get_file(path)
+            if data is None:
+                return self._send(404, b'Not found', 'text/plain')
+            content_type = CONTENT_TYPES.get(os.path.splitext(path)[1], 'application/octet-stream')
+            return self._send(200, data, content_type)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def snapshot_input_file():
+    try:
+        st = os.stat(INPUT_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+def watch(store, interval=0.25):
+    last = snapshot_input_file()
+    while True:
+        time.sleep(interval)
+        current = snapshot_input_file()
+        if current == last:
+            continue
+        # Wait for the file to settle so a half-saved workbook is not read
+        time.sleep(interval)
+        settled = snapshot_input_file()
+        if settled != current:
+            continue
+        last = settled
+        if settled is None:
+            print(f"{os.path.basename(INPUT_FILE)} was removed, still serving the last good build")
+            continue
+        print(f"Detected change in {os.path.basename(INPUT_FILE)}")
+        store.rebuild()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve district evolution pages and rebuild them when the source workbook changes.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--renderers', default=','.join(RENDERERS),
+                        help=f"Comma-separated renderers to keep warm ({', '.join(RENDERERS)})")
+    parser.add_argument('--write', action='store_true', help="Also mirror rendered files to output/, deleting ones that are no longer produced")
+    parser.add_argument('--interval', type=float, default=0.25, help="Polling interval in seconds")
+    args = parser.parse_args(argv)
+
+    renderers = [r.strip() for r in args.renderers.split(',') if r.strip()]
+    unknown = [r for r in renderers if r not in RENDERERS]
+    if unknown:
+        parser.error(f"Unknown renderer(s): {', '.join(unknown)}")
+
+    disk_writer = OutputWriter() if args.write else None
+    store = DistrictStore(renderers, disk_writer)
+    print("Loading data and rendering all states...")
+    store.rebuild()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(store))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving on http://{args.host}:{args.port}/ (watching {INPUT_FILE})")
+
+    try:
+        watch(store, args.interval)
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    finally:
+        server.shutdown()
+        if disk_writer is not None:
+            disk_writer.close()
+
+if __name__ == "__main__":
+    main()
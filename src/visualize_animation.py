@@ -0,0 +1,263 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from lineage_store import LineageStore, UNKNOWN_YEAR
+from output_writer import OutputWriter, emit
+
+def build_animation_frames(store):
+    """
+    Splits a state's lineage into one diff per census year.
+
+    Districts appear in the year they are first seen (LineageStore
+    first_seen_years) and keep that x position throughout; each edge appears
+    in its own census year, or once both ends exist for undated edges. Each
+    frame lists only what is new in that year, so the payload grows with the
+    number of changes rather than with frames x graph size.
+    """
+    years, known = store.fill_unknown_years(store.first_seen_years())
+    xs, ys = store.layered_positions(years)
+
+    edge_known = store.years != UNKNOWN_YEAR
+    frame_years = np.unique(np.concatenate([years, store.years[edge_known]]))
+    has_initial = bool((~known).any())
+    node_frame = np.searchsorted(frame_years, years)
+
+    # Dated edges land in their own year, which is never before either end
+    # is first seen; undated edges wait for their later end.
+    sources = store.sources()
+    edge_frame = np.maximum(node_frame[sources], node_frame[store.targets])
+    edge_frame[edge_known] = np.searchsorted(frame_years, store.years[edge_known])
+
+    # Drop duplicate rows so each edge is drawn once, in its earliest frame.
+    keys = sources.astype(np.int64) * max(store.num_nodes, 1) + store.targets
+    by_key = np.lexsort((edge_frame, keys))
+    _, first = np.unique(keys[by_key], return_index=True)
+    first = by_key[first]
+    sources, targets, edge_frame = sources[first], store.targets[first], edge_frame[first]
+
+    node_order = np.argsort(node_frame, kind='stable')
+    node_bounds = np.searchsorted(node_frame[node_order], np.arange(len(frame_years) + 1))
+    edge_order = np.lexsort((targets, sources, edge_frame))
+    edge_bounds = np.searchsorted(edge_frame[edge_order], np.arange(len(frame_years) + 1))
+
+    frames = []
+    for f, year in enumerate(frame_years.tolist()):
+        new_nodes = node_order[node_bounds[f]:node_bounds[f + 1]]
+        new_edges = edge_order[edge_bounds[f]:edge_bounds[f + 1]]
+        edge_src = sources[new_edges].tolist()
+        edge_dst = targets[new_edges].tolist()
+
+        splits = {}
+        for s, t in zip(edge_src, edge_dst):
+            splits.setdefault(s, []).append(t)
+
+        frames.append({
+            'year': year,
+            'initial': f == 0 and has_initial,
+            'nodes': new_nodes.tolist(),
+            'edges': [v for pair in zip(edge_src, edge_dst) for v in pair],
+            'splits': [[parent, children] for parent, children in splits.items()],
+        })
+
+    return {
+        'names': store.names,
+        'x': xs.tolist(),
+        'y': ys.tolist(),
+        'frames': frames,
+    }
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>District Evolution Animation - __TITLE__</title>
+<style>
+  body { font-family: Arial, sans-serif; margin: 20px; background: #ffffff; color: #333333; }
+  h1 { font-size: 20px; }
+  #controls { margin: 10px 0; display: flex; align-items: center; gap: 12px; }
+  #year { font-size: 28px; font-weight: bold; min-width: 90px; }
+  #slider { flex: 1; }
+  #changes { font-size: 13px; min-height: 40px; color: #555; }
+  svg { border: 1px solid #eee; }
+  .edge { stroke: #bdc3c7; stroke-width: 1.2; fill: none; }
+  .node { stroke: #ffffff; stroke-width: 1; }
+  .node.fresh { stroke: #e74c3c; stroke-width: 2.5; }
+  .label { font-size: 10px; }
+</style>
+</head>
+<body>
+<h1>District Evolution - __TITLE__</h1>
+<div id="controls">
+  <button id="play">Play</button>
+  <span id="year"></span>
+  <input id="slider" type="range" min="0" value="0" step="1">
+</div>
+<div id="changes"></div>
+<svg id="canvas"></svg>
+<script>
+var DATA = __DATA__;
+(function () {
+  var SVG_NS = "http://www.w3.org/2000/svg";
+  var names = DATA.names, frames = DATA.frames;
+  var xs = DATA.x, ys = DATA.y;
+  var minX = Math.min.apply(null, xs), maxX = Math.max.apply(null, xs);
+  var minY = Math.min.apply(null, ys), maxY = Math.max.apply(null, ys);
+  var margin = 120, width = 1100, rowHeight = 26;
+  var height = Math.max(200, (maxY - minY) * rowHeight + 2 * 40);
+  var svg = document.getElementById("canvas");
+  svg.setAttribute("width", width);
+  svg.setAttribute("height", height);
+  var edgeLayer = document.createElementNS(SVG_NS, "g");
+  var nodeLayer = document.createElementNS(SVG_NS, "g");
+  svg.appendChild(edgeLayer);
+  svg.appendChild(nodeLayer);
+
+  function px(i) { return maxX === minX ? width / 2 : margin + (xs[i] - minX) / (maxX - minX) * (width - 2 * margin); }
+  function py(i) { return 40 + (ys[i] - minY) * rowHeight; }
+  function color(i) {
+    var t = maxX === minX ? 0 : (xs[i] - minX) / (maxX - minX);
+    return "hsl(" + Math.round(260 - 200 * t) + ", 60%, 45%)";
+  }
+
+  // Elements created by each frame, so stepping back only removes that frame's diff.
+  var created = frames.map(function () { return []; });
+  var current = -1;
+
+  function addNode(f, i) {
+    var g = document.createElementNS(SVG_NS, "g");
+    var c = document.createElementNS(SVG_NS, "circle");
+    c.setAttribute("cx", px(i)); c.setAttribute("cy", py(i)); c.setAttribute("r", 7);
+    c.setAttribute("fill", color(i));
+    c.setAttribute("class", "node fresh");
+    var title = document.createElementNS(SVG_NS, "title");
+    title.textContent = names[i] + (frames[f].initial ? "" : " (" + frames[f].year + ")");
+    c.appendChild(title);
+    var t = document.createElementNS(SVG_NS, "text");
+    t.setAttribute("x", px(i) + 10); t.setAttribute("y", py(i) + 3);
+    t.setAttribute("class", "label");
+    t.textContent = names[i];
+    g.appendChild(c); g.appendChild(t);
+    nodeLayer.appendChild(g);
+    created[f].push(g);
+  }
+
+  function addEdge(f, s, d) {
+    var p = document.createElementNS(SVG_NS, "path");
+    var x0 = px(s), y0 = py(s), x1 = px(d), y1 = py(d), mx = (x0 + x1) / 2;
+    p.setAttribute("d", "M" + x0 + "," + y0 + " C" + mx + "," + y0 + " " + mx + "," + y1 + " " + x1 + "," + y1);
+    p.setAttribute("class", "edge");
+    edgeLayer.appendChild(p);
+    created[f].push(p);
+  }
+
+  function apply(f) {
+    var frame = frames[f];
+    frame.nodes.forEach(function (i) { addNode(f, i); });
+    for (var k = 0; k < frame.edges.length; k += 2) { addEdge(f, frame.edges[k], frame.edges[k + 1]); }
+  }
+
+  function revert(f) {
+    created[f].forEach(function (el) { el.parentNode.removeChild(el); });
+    created[f] = [];
+  }
+
+  function describe(f) {
+    var frame = frames[f];
+    if (frame.initial) { return frame.nodes.length + " original district(s)"; }
+    var parts = frame.splits.map(function (s) {
+      return names[s[0]] + " \\u2192 " + s[1].map(function (c) { return names[c]; }).join(", ");
+    });
+    return frame.nodes.length + " new district(s)" + (parts.length ? ": " + parts.join("; ") : "");
+  }
+
+  function show(target) {
+    while (current < target) { current += 1; apply(current); }
+    while (current > target) { revert(current); current -= 1; }
+    Array.prototype.forEach.call(nodeLayer.querySelectorAll("circle"), function (c) { c.setAttribute("class", "node"); });
+    created[current].forEach(function (el) {
+      if (el.tagName === "g") { el.firstChild.setAttribute("class", "node fresh"); }
+    });
+    document.getElementById("year").textContent = frames[current].initial ? "Initial" : frames[current].year;
+    document.getElementById("changes").textContent = describe(current);
+    slider.value = current;
+  }
+
+  var slider = document.getElementById("slider");
+  slider.max = frames.length - 1;
+  slider.addEventListener("input", function () { stop(); show(parseInt(slider.value, 10)); });
+
+  var timer = null;
+  var button = document.getElementById("play");
+  function stop() { if (timer) { clearInterval(timer); timer = null; button.textContent = "Play"; } }
+  button.addEventListener("click", function () {
+    if (timer) { stop(); return; }
+    if (current >= frames.length - 1) { show(0); }
+    button.textContent = "Pause";
+    timer = setInterval(function () {
+      if (current >= frames.length - 1) { stop(); return; }
+      show(current + 1);
+    }, 1200);
+  });
+
+  show(0);
+})();
+</script>
+</body>
+</html>
+"""
+
+def generate_animation(state_name, df, output_dir, writer=None):
+    state_df = df[df['filter_state'] == state_name]
+
+    if state_df.empty:
+        print(f"No data found for state: {state_name}")
+        return None
+
+    store = LineageStore.from_frame(state_df)
+    data = build_animation_frames(store)
+    payload = json.dumps(data, separators=(',', ':')).replace("</", "<\\/")
+    html = (PAGE_TEMPLATE
+            .replace("__TITLE__", state_name.replace("&", "&amp;").replace("<", "&lt;"))
+            .replace("__DATA__", payload))
+
+    output_path = os.path.join(output_dir, f"{state_name.replace(' ', '_')}_Animation.html")
+    emit(output_path, html, writer)
+    print(f"Animation generated: {output_path} ({len(data['frames'])} frames)")
+    return output_path
+
+def main():
+    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    transform_file = os.path.join(base_dir, 'data', 'processed', 'district_changes.csv')
+    output_dir = os.path.join(base_dir, 'output', 'animation')
+
+    if not os.path.exists(transform_file):
+        print(f"Error: {transform_file} not found. Please run etl.py first.")
+        return
+
+    print("Loading data...")
+    df = pd.read_csv(transform_file)
+
+    if 'filter_state' not in df.columns:
+        if 'state' in df.columns:
+            df.rename(columns={'state': 'filter_state'}, inplace=True)
+
+    unique_states = sorted(df['filter_state'].dropna().unique())
+    print(f"Generating animations for {len(unique_states)} states...")
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    with OutputWriter() as writer:
+        for state in unique_states:
+            generate_animation(state, df, output_dir, writer=writer)
+    if writer.close():
+        print("Some files could not be written.")
+        return 1
+    print(f"All animations generated in {output_dir}")
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,11 @@
 import pandas as pd
 from pyvis.network import Network
 import os
+import sys
 import webbrowser
+from output_writer import OutputWriter, emit
 
-def create_interactive_graph(state_name, df, output_dir):
+def create_interactive_graph(state_name, df, output_dir, writer=None):
     state_df = df[df['filter_state'] == state_name].copy()
     
     if state_df.empty:
@@ -135,7 +137,7 @@ def create_interactive_graph(state_name, df, output_dir):
     output_filename = f"{state_name.replace(' ', '_')}_interactive.html"
     output_path = os.path.join(output_dir, output_filename)
     
-    net.write_html(output_path)
+    emit(output_path, net.generate_html(), writer)
     print(f"Graph generated: {output_path}")
     return output_path
 
@@ -169,9 +171,13 @@ def main():
     if not os.path.exists(visuals_dir):
         os.makedirs(visuals_dir)
         
-    for state in unique_states:
-        create_interactive_graph(state, df, visuals_dir)
+    with OutputWriter() as writer:
+        for state in unique_states:
+            create_interactive_graph(state, df, visuals_dir, writer=writer)
+    if writer.close():
+        print("Some files could not be written.")
+        return 1
     print(f"All graphs generated in {visuals_dir}")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,67 +1,29 @@
 import pandas as pd
-import networkx as nx
 import plotly.graph_objects as go
 import os
 import sys
+from lineage_store import LineageStore
+from output_writer import OutputWriter, emit
 
-def generate_plotly_graph(state_name, df, save_dir=None):
+def generate_plotly_graph(state_name, df, save_dir=None, writer=None):
     state_df = df[df['filter_state'] == state_name].copy()
     
     if state_df.empty:
         print(f"No data found for state: {state_name}")
         return
 
-    G = nx.DiGraph()
-    district_years = {}
-    
-    def parse_year(val):
-        try:
-            return int(float(str(val)))
-        except:
-            return None
-
-    for _, row in state_df.iterrows():
-        src = row['source_district']
-        dst = row['dest_district']
-        year_val = parse_year(row['dest_year'])
-        
-        G.add_edge(src, dst)
-        
-        if year_val:
-            district_years[dst] = year_val
-            
-    known_years = [y for y in district_years.values() if y is not None]
-    base_year = min(known_years) - 5 if known_years else 1950
-    
-    for node in G.nodes():
-        if node not in district_years:
-            district_years[node] = base_year
+    store = LineageStore.from_frame(state_df)
+    G = store.to_networkx()
 
     if len(G.nodes) == 0:
         print("Graph has no nodes.")
         return
 
-    pos = {}
-    nodes_by_year = {}
-    for node, year in district_years.items():
-        if year not in nodes_by_year:
-            nodes_by_year[year] = []
-        nodes_by_year[year].append(node)
-        
-    sorted_years = sorted(nodes_by_year.keys())
-    
-    for year in sorted_years:
-        nodes = nodes_by_year[year]
-        nodes.sort()
-        count = len(nodes)
-        
-        if count == 1:
-            ys = [0]
-        else:
-            ys = [i - (count - 1) / 2 for i in range(count)]
-            
-        for node, y in zip(nodes, ys):
-            pos[node] = (year, y)
+    years, _ = store.fill_unknown_years(store.formation_years())
+    district_years = dict(zip(store.names, years.tolist()))
+
+    xs, ys = store.layered_positions(years)
+    pos = dict(zip(store.names, zip(xs.tolist(), ys.tolist())))
 
     edge_x = []
     edge_y = []
@@ -83,8 +45,6 @@ def generate_plotly_graph(state_name, df, save_dir=None):
     node_text = []
     node_color_values = []
     
-    degrees = dict(G.degree)
-    
     for node in G.nodes():
         x, y = pos[node]
         node_x.append(x)
@@ -150,8 +110,9 @@ def generate_plotly_graph(state_name, df, save_dir=None):
     
     if save_dir:
         output_path = os.path.join(save_dir, f"{state_name.replace(' ', '_')}_Timeline.html")
-        fig.write_html(output_path)
+        emit(output_path, fig.to_html(), writer)
         print(f"Saved: {output_path}")
+        return output_path
     else:
         print(f"Opening Plotly graph for {state_name}...")
         fig.show()
@@ -186,9 +147,13 @@ def main():
     if not os.path.exists(visuals_dir):
         os.makedirs(visuals_dir)
 
-    for state in unique_states:
-        generate_plotly_graph(state, df, save_dir=visuals_dir)
+    with OutputWriter() as writer:
+        for state in unique_states:
+            generate_plotly_graph(state, df, save_dir=visuals_dir, writer=writer)
+    if writer.close():
+        print("Some files could not be written.")
+        return 1
     print(f"All graphs saved to {visuals_dir}")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -2,20 +2,18 @@ import pandas as pd
 from pyecharts import options as opts
 from pyecharts.charts import Tree
 import os
+import sys
+from lineage_store import LineageStore
+from output_writer import OutputWriter, emit
 
 def build_tree_structure(state_name, df_changes):
     state_df = df_changes[df_changes['filter_state'] == state_name]
     
-    adj_list = {}
-    for _, row in state_df.iterrows():
-        parent = row['source_district']
-        child = row['dest_district']
-        year = str(row['dest_year']) if pd.notna(row['dest_year']) else ""
-        
-        if parent not in adj_list:
-            adj_list[parent] = []
-        
-        adj_list[parent].append({"name": child, "value": year})
+    store = LineageStore.from_frame(state_df)
+    adj_list = {
+        parent: [{"name": child, "value": str(year) if year is not None else ""} for child, year in children]
+        for parent, children in store.children_by_parent().items()
+    }
 
     all_children = set(state_df['dest_district'])
     all_parents = set(adj_list.keys())
@@ -51,12 +49,12 @@ def build_tree_structure(state_name, df_changes):
     
     return data
 
-def generate_professional_chart(state_name, df_changes, output_dir):
+def generate_professional_chart(state_name, df_changes, output_dir, writer=None):
     try:
         data = build_tree_structure(state_name, df_changes)
         if not data:
             print(f"Skipping {state_name}: No valid tree structure found.")
-            return
+            return None
 
         c = (
             Tree()
@@ -87,11 +85,13 @@ def generate_professional_chart(state_name, df_changes, output_dir):
         )
         
         output_path = os.path.join(output_dir, f"{state_name.replace(' ', '_')}_Lineage.html")
-        c.render(output_path)
+        emit(output_path, c.render_embed(), writer)
         print(f"Generated Professional Tree for: {state_name}")
+        return output_path
         
     except Exception as e:
         print(f"Could not generate for {state_name} due to data complexity: {e}")
+        return None
 
 def main():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -115,8 +115,12 @@ def main():
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    for state in states:
-        generate_professional_chart(state, df, output_dir)
+    with OutputWriter() as writer:
+        for state in states:
+            generate_professional_chart(state, df, output_dir, writer=writer)
+    if writer.close():
+        print("Some files could not be written.")
+        return 1
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
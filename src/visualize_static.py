@@ -1,7 +1,36 @@
 import pandas as pd
 import networkx as nx
 import matplotlib.pyplot as plt
+import io
 import os
+import sys
+from output_writer import OutputWriter, emit, write_atomic
+
+def generate_static_graph(state, state_df, output_path, writer=None):
+    G = nx.DiGraph()
+    
+    for _, row in state_df.iterrows():
+        src = row['source_district']
+        dst = row['dest_district']
+        year = str(row['dest_year']) if pd.notna(row['dest_year']) else ""
+        
+        G.add_edge(src, dst, label=year)
+
+    plt.figure(figsize=(12, 8))
+    pos = nx.spring_layout(G, seed=42, k=0.5)
+    
+    nx.draw(G, pos, with_labels=True, node_color='lightblue', 
+            node_size=2000, font_size=8, font_weight='bold', 
+            arrows=True, arrowsize=20)
+    
+    edge_labels = nx.get_edge_attributes(G, 'label')
+    nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
+    
+    plt.title(f"District Lineage - {state}")
+    buf = io.BytesIO()
+    plt.savefig(buf, format='png')
+    plt.close()
+    emit(output_path, buf.getvalue(), writer)
 
 def generate_static_visuals():
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -11,58 +40,45 @@ def generate_static_visuals():
     
     if not os.path.exists(transform_file):
         print(f"Error: {transform_file} not found.")
-        return
+        return 1
 
     print("Loading data...")
     df = pd.read_csv(transform_file)
     
     print("Generating visualizations...")
     states = df['filter_state'].unique()
-    generated_states = []
 
     if not os.path.exists(visuals_dir):
         os.makedirs(visuals_dir)
 
-    for state in states:
-        print(f"Processing state: {state}")
-        state_df = df[df['filter_state'] == state]
-        
-        G = nx.DiGraph()
-        
-        for _, row in state_df.iterrows():
-            src = row['source_district']
-            dst = row['dest_district']
-            year = str(row['dest_year']) if pd.notna(row['dest_year']) else ""
+    state_paths = {}
+    with OutputWriter() as writer:
+        for state in states:
+            print(f"Processing state: {state}")
+            state_df = df[df['filter_state'] == state]
             
-            G.add_edge(src, dst, label=year)
+            output_path = os.path.join(visuals_dir, f"{state}_lineage.png".replace(" ", "_"))
+            generate_static_graph(state, state_df, output_path, writer)
+            state_paths[state] = output_path
 
-        plt.figure(figsize=(12, 8))
-        pos = nx.spring_layout(G, seed=42, k=0.5)
-        
-        nx.draw(G, pos, with_labels=True, node_color='lightblue', 
-                node_size=2000, font_size=8, font_weight='bold', 
-                arrows=True, arrowsize=20)
-        
-        edge_labels = nx.get_edge_attributes(G, 'label')
-        nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels)
-        
-        plt.title(f"District Lineage - {state}")
-        output_path = os.path.join(visuals_dir, f"{state}_lineage.png".replace(" ", "_"))
-        plt.savefig(output_path)
-        plt.close()
-        generated_states.append(state)
+    failed_paths = {path for path, _ in writer.close()}
+    generated_states = [state for state, path in state_paths.items() if path not in failed_paths]
 
     print("Creating report...")
     if not os.path.exists(os.path.dirname(report_file)):
         os.makedirs(os.path.dirname(report_file))
 
-    with open(report_file, 'w') as f:
-        f.write("# District Visualization Summary\n\n")
-        f.write("Graphs were generated for the following states:\n\n")
-        for state in sorted(generated_states):
-            f.write(f"- {state}\n")
+    lines = ["# District Visualization Summary\n\n",
+             "Graphs were generated for the following states:\n\n"]
+    for state in sorted(generated_states):
+        lines.append(f"- {state}\n")
+    write_atomic(report_file, "".join(lines))
     
+    if failed_paths:
+        print(f"Done with errors: {len(failed_paths)} image(s) could not be written.")
+        return 1
     print("Done!")
+    return 0
 
 if __name__ == "__main__":
-    generate_static_visuals()
+    sys.exit(generate_static_visuals())